@@ -3,9 +3,22 @@ Safety & Scheduling Constants
 These values control bot behavior timing and rate limiting
 """
 
+import random
 from enum import Enum
 from datetime import time
 
+
+def compute_adaptive_delay(min_delay: float, max_delay: float,
+                           max_cap: float, multiplier: float = 1.0) -> float:
+    """
+    Shared delay calculation for RateLimiter and Scheduler.
+    Scales the [min_delay, max_delay] range by the backoff multiplier,
+    caps the upper bound at max_cap, and returns a random delay within it.
+    """
+    lo = min_delay * multiplier
+    hi = min(max_delay * multiplier, max_cap)
+    return random.uniform(lo, hi)
+
 class TimeWindow(Enum):
     """Active hours for the bot - when it should be running"""
     MORNING = (time(9, 0), time(11, 0))      # 9 AM - 11 AM
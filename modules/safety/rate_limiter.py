@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 import time as time_module
 from typing import Optional
 from modules.helpers import print_lg
-from .constants import RATE_LIMIT_CONFIG
+from .constants import RATE_LIMIT_CONFIG, compute_adaptive_delay
 
 
 class RateLimiter:
@@ -25,10 +25,30 @@ class RateLimiter:
         self.applications_today = 0
         self.last_application_time = None
         self.daily_limit_reached = False
-        self.backoff_multiplier = 1.0
         self.last_backoff_reset = datetime.now()
         self.rate_limit_detected_at = None
-        
+
+        # Backoff is tracked as an integer level (0 = no backoff) instead of a
+        # repeatedly-multiplied float, so `level == 0` checks stay exact.
+        # The effective multiplier per level is precomputed and capped so it
+        # never pushes delays beyond max_backoff_delay_seconds.
+        self._backoff_level = 0
+        step = self.config["backoff_multiplier"]
+        cap_ratio = self.config["max_backoff_delay_seconds"] / self.config["max_delay_seconds"]
+        self._backoff_multipliers = [1.0]
+        # A step <= 1.0 means backoff growth is disabled; looping on it would
+        # never reach the cap. The iteration bound is defensive - the table
+        # grows geometrically, so it stays tiny for any sane config.
+        if step > 1.0:
+            while self._backoff_multipliers[-1] < cap_ratio and len(self._backoff_multipliers) < 64:
+                self._backoff_multipliers.append(min(self._backoff_multipliers[-1] * step, cap_ratio))
+        self._max_backoff_level = len(self._backoff_multipliers) - 1
+
+    @property
+    def backoff_multiplier(self) -> float:
+        """Effective delay multiplier for the current backoff level."""
+        return self._backoff_multipliers[self._backoff_level]
+
     def can_apply(self) -> bool:
         """
         Check if bot is allowed to apply to next job.
@@ -55,22 +75,13 @@ class RateLimiter:
         Returns:
             Delay in seconds (between min_delay and max_delay, with backoff multiplier)
         """
-        min_delay = self.config["min_delay_seconds"]  # 120 (2 min)
-        max_delay = self.config["max_delay_seconds"]  # 300 (5 min)
-        
-        # Apply adaptive backoff
-        if self.config["adaptive_backoff_enabled"]:
-            min_delay *= self.backoff_multiplier
-            max_delay *= self.backoff_multiplier
-            
-            # Cap at maximum
-            max_backoff = self.config["max_backoff_delay_seconds"]  # 900 (15 min)
-            max_delay = min(max_delay, max_backoff)
-        
-        # Random delay within calculated range
-        import random
-        actual_delay = random.uniform(min_delay, max_delay)
-        return actual_delay
+        multiplier = self.backoff_multiplier if self.config["adaptive_backoff_enabled"] else 1.0
+        return compute_adaptive_delay(
+            self.config["min_delay_seconds"],   # 120 (2 min)
+            self.config["max_delay_seconds"],   # 300 (5 min)
+            self.config["max_backoff_delay_seconds"],  # 900 (15 min)
+            multiplier
+        )
     
     def wait_before_next_application(self):
         """
@@ -109,29 +120,26 @@ class RateLimiter:
         if not self.config["adaptive_backoff_enabled"]:
             return False
         
-        # Increase backoff multiplier
-        if self.backoff_multiplier == 1.0:
+        # Increase backoff level
+        if self._backoff_level == 0:
             print_lg("[RATE_LIMIT] Rate limiting detected! Increasing delays...")
             self.rate_limit_detected_at = datetime.now()
-        
+
         old_multiplier = self.backoff_multiplier
-        self.backoff_multiplier = min(
-            self.backoff_multiplier * self.config["backoff_multiplier"],
-            self.config["max_backoff_delay_seconds"] / self.config["max_delay_seconds"]
-        )
-        
+        self._backoff_level = min(self._backoff_level + 1, self._max_backoff_level)
+
         print_lg(f"[RATE_LIMIT] Backoff multiplier: {old_multiplier:.2f}x → {self.backoff_multiplier:.2f}x")
         return True
-    
+
     def reset_backoff(self):
-        """Reset backoff multiplier if safe operation detected"""
-        if self.backoff_multiplier > 1.0:
+        """Reset backoff level if safe operation detected"""
+        if self._backoff_level > 0:
             time_since_detection = datetime.now() - self.rate_limit_detected_at
             reset_after = self.config["reset_backoff_after_hours"] * 3600  # Convert to seconds
-            
+
             if time_since_detection.total_seconds() > reset_after:
                 print_lg(f"[RATE_LIMIT] Safe operation detected for {self.config['reset_backoff_after_hours']}h. Resetting backoff.")
-                self.backoff_multiplier = 1.0
+                self._backoff_level = 0
                 self.rate_limit_detected_at = None
     
     def _check_day_boundary(self):
@@ -153,7 +161,7 @@ class RateLimiter:
             "percent_of_quota": (self.applications_today / self.config["max_daily_applications"]) * 100,
             "daily_limit_reached": self.daily_limit_reached,
             "backoff_multiplier": self.backoff_multiplier,
-            "rate_limited": self.backoff_multiplier > 1.0,
+            "rate_limited": self._backoff_level > 0,
             "last_application": self.last_application_time.strftime("%H:%M:%S") if self.last_application_time else "Never"
         }
     
@@ -7,7 +7,7 @@ from datetime import datetime, time, timedelta
 import random
 from typing import Tuple, Optional
 from modules.helpers import print_lg, sleep
-from .constants import SCHEDULER_CONFIG
+from .constants import SCHEDULER_CONFIG, compute_adaptive_delay
 
 
 class Scheduler:
@@ -151,20 +151,12 @@ class Scheduler:
         Returns:
             Actual delay in seconds
         """
-        min_delay = self.config.get("min_delay_seconds", 120)
-        max_delay = self.config.get("max_delay_seconds", 300)
-        
-        # Apply backoff
-        min_delay *= backoff_multiplier
-        max_delay *= backoff_multiplier
-        
-        # Cap at maximum
-        max_backoff = self.config.get("max_backoff_delay_seconds", 900)
-        max_delay = min(max_delay, max_backoff)
-        
-        # Random delay within range
-        actual_delay = random.uniform(min_delay, max_delay)
-        return actual_delay
+        return compute_adaptive_delay(
+            self.config.get("min_delay_seconds", 120),
+            self.config.get("max_delay_seconds", 300),
+            self.config.get("max_backoff_delay_seconds", 900),
+            backoff_multiplier
+        )
     
     def end_session(self):
         """Call when ending a job application session"""
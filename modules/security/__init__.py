@@ -9,10 +9,15 @@ Components:
 - AccountMonitor: Account security monitoring and anomaly detection
 """
 
-from modules.security.encrypted_vault import EncryptedVault
-from modules.security.secrets_manager import SecretsManager
-from modules.security.audit_logger import AuditLogger
-from modules.security.account_monitor import AccountMonitor
+# Submodules are imported lazily (PEP 562) so that importing modules.security
+# doesn't pay for heavy dependencies (e.g. cryptography) unless the
+# corresponding component is actually used.
+_LAZY_IMPORTS = {
+    "EncryptedVault": "encrypted_vault",
+    "SecretsManager": "secrets_manager",
+    "AuditLogger": "audit_logger",
+    "AccountMonitor": "account_monitor",
+}
 
 __all__ = [
     "EncryptedVault",
@@ -20,3 +25,17 @@ __all__ = [
     "AuditLogger",
     "AccountMonitor"
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        module = importlib.import_module(f"modules.security.{_LAZY_IMPORTS[name]}")
+        obj = getattr(module, name)
+        globals()[name] = obj  # Cache so the import only happens once
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
@@ -0,0 +1,26 @@
+"""
+Numba-compiled counting kernels for AccountMonitor's SoA columns.
+Kept deliberately tiny (one array in, one scalar out) so compile time stays
+negligible; cache=True persists the compiled code across processes.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator stand-in when numba isn't installed."""
+        def wrap(fn):
+            return fn
+        return wrap
+
+
+@njit(cache=True)
+def sum_flags_from(flags, start):
+    """Sum the flag column from index start to the end."""
+    total = 0
+    for i in range(start, len(flags)):
+        total += flags[i]
+    return total
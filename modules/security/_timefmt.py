@@ -0,0 +1,23 @@
+"""
+Fast ISO-8601 timestamp formatting for the security loggers.
+datetime.now().isoformat() costs tens of microseconds per call; since log
+bursts land within the same second, the second-resolution prefix is cached
+and only the fractional part is formatted per call.
+"""
+
+from datetime import datetime
+from time import time
+
+_cache_sec = 0
+_cache_prefix = ""
+
+
+def now_iso() -> str:
+    """Current local time as an ISO-8601 string with microseconds."""
+    global _cache_sec, _cache_prefix
+    t = time()
+    sec = int(t)
+    if sec != _cache_sec:
+        _cache_prefix = datetime.fromtimestamp(sec).isoformat()
+        _cache_sec = sec
+    return f"{_cache_prefix}.{min(int((t - sec) * 1_000_000), 999_999):06d}"
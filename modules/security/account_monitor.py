@@ -5,10 +5,67 @@ Monitors login patterns, application rates, and suspicious activities
 
 import json
 import time
-from datetime import datetime, timedelta
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
 from typing import Dict, List, Optional
-from collections import deque
+from collections import Counter, deque
 from modules.helpers import print_lg
+from modules.security._monitor_kernels import NUMBA_AVAILABLE, sum_flags_from
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class LoginEvent:
+    """Login record; slotted to cut per-event memory and field-access cost."""
+    __slots__ = ('ts', 'username', 'success', 'ip_address', 'location')
+
+    def __init__(self, ts, username, success, ip_address, location):
+        self.ts = ts
+        self.username = username
+        self.success = success
+        self.ip_address = ip_address
+        self.location = location
+
+    def to_dict(self) -> Dict:
+        return {"ts": self.ts, "username": self.username, "success": self.success,
+                "ip_address": self.ip_address, "location": self.location}
+
+
+class AppEvent:
+    """Job-application record stored in the monitor history."""
+    __slots__ = ('ts', 'company', 'job_title', 'success')
+
+    def __init__(self, ts, company, job_title, success):
+        self.ts = ts
+        self.company = company
+        self.job_title = job_title
+        self.success = success
+
+    def to_dict(self) -> Dict:
+        return {"ts": self.ts, "company": self.company,
+                "job_title": self.job_title, "success": self.success}
+
+
+class ErrorEvent:
+    """Error record stored in the monitor history."""
+    __slots__ = ('ts', 'error_type', 'message', 'context')
+
+    def __init__(self, ts, error_type, message, context):
+        self.ts = ts
+        self.error_type = error_type
+        self.message = message
+        self.context = context
+
+    def to_dict(self) -> Dict:
+        return {"ts": self.ts, "error_type": self.error_type,
+                "message": self.message, "context": self.context}
 
 
 class AccountMonitor:
@@ -22,14 +79,36 @@ class AccountMonitor:
     - Health scoring (0-100 scale)
     - Anomaly pattern detection
     """
-    
+
+    # Health-score deductions, keyed by the condition that triggers them.
+    # Tunable at runtime without touching the detection logic.
+    PENALTIES = {
+        "failed_login": 10,
+        "error_rate": 5,
+        "burst_activity": 15,
+        "failed_logins": 10,
+        "error_spike": 10,
+        "unusual_location": 5,
+        "unusual_time": 3,
+    }
+
     def __init__(self):
         """Initialize account monitor."""
         # Activity tracking (time-series data)
         self.login_history = deque(maxlen=1000)        # Last 1000 logins
         self.application_history = deque(maxlen=5000)  # Last 5000 applications
         self.error_history = deque(maxlen=500)         # Last 500 errors
-        
+
+        # Struct-of-arrays columns for the hot numeric fields: sorted epoch
+        # timestamps (bisectable for window cutoffs) and success flags, kept
+        # as typed C arrays so counting loops never touch the event dicts.
+        # Append-only, lazily trimmed in lockstep via _append_col.
+        self._login_ts = array('d')
+        self._login_success = array('b')
+        self._app_ts = array('d')
+        self._app_success = array('b')
+        self._err_ts = array('d')
+
         # Statistics
         self.health_score = 100
         self.last_health_check = datetime.now()
@@ -40,7 +119,39 @@ class AccountMonitor:
         self.max_failed_logins_per_day = 3
         self.max_errors_per_hour = 5
         self.unusual_login_location_timeout_hours = 24
-        
+
+        # Time-wheel counters, maintained incrementally in record_* so the
+        # _count_* helpers are O(1) sums instead of full deque scans.
+        # Hour wheels cover the last 24 hours, minute wheels the last hour.
+        self._login_wheel = [0] * 24
+        self._failed_login_wheel = [0] * 24
+        self._app_wheel = [0] * 60
+        self._error_wheel = [0] * 60
+        self._wheel_tick = int(time.time())
+
+        # Rolling window of the last 10 successful-login locations with a
+        # membership counter, so the unusual-location check is O(1) instead
+        # of re-scanning recent logins.
+        self._recent_locs = deque(maxlen=10)
+        self._recent_locs_count = Counter()
+
+        # Running per-type error counts for everything still retained in
+        # error_history, maintained in record_error so the summary doesn't
+        # re-group up to 500 events per call.
+        self._errors_by_type = Counter()
+
+        # Sample the per-application log line so burst ingest (the very
+        # scenario this monitor watches for) isn't throttled by stdout I/O.
+        # Alerts from detect_suspicious_patterns stay unconditional.
+        self._log_every_n = 50
+        self._log_counter = 0
+
+        # Short-TTL cache for get_health_status (dashboard/monitor loops
+        # poll it far more often than the underlying data changes)
+        self._health_cache = None
+        self._health_cache_key = None
+        self._health_cache_at = 0.0
+
         print_lg("[MONITOR] Initialized Account Monitor")
     
     def record_login(self, username: str, success: bool, ip_address: str = None,
@@ -57,29 +168,34 @@ class AccountMonitor:
         Returns:
             True if recorded successfully
         """
-        try:
-            login_event = {
-                "timestamp": datetime.now().isoformat(),
-                "username": username,
-                "success": success,
-                "ip_address": ip_address,
-                "location": location
-            }
-            
-            self.login_history.append(login_event)
-            
+        # No try/except here: this path is dict/array appends that cannot
+        # realistically fail, and print_lg handles its own I/O errors.
+        now = time.time()
+        self.login_history.append(LoginEvent(now, username, success, ip_address, location))
+        self._append_col(self._login_ts, now, 1000)
+        self._append_col(self._login_success, 1 if success else 0, 1000)
+
+        if success and location:
+            if len(self._recent_locs) == self._recent_locs.maxlen:
+                evicted = self._recent_locs[0]
+                self._recent_locs_count[evicted] -= 1
+                if self._recent_locs_count[evicted] <= 0:
+                    del self._recent_locs_count[evicted]
+            self._recent_locs.append(location)
+            self._recent_locs_count[location] += 1
+
+        self._advance_wheels(now)
+        hour_slot = int(now // 3600) % 24
+        self._login_wheel[hour_slot] += 1
+        if not success:
+            self._failed_login_wheel[hour_slot] += 1
+
             # Update health score for failed logins
-            if not success:
-                failed_count = self._count_failed_logins_today()
-                if failed_count > self.max_failed_logins_per_day:
-                    self.health_score = max(0, self.health_score - 10)
-            
-            print_lg(f"[MONITOR] Login recorded: {username} ({'success' if success else 'failed'})")
-            return True
-            
-        except Exception as e:
-            print_lg(f"[MONITOR] Error recording login: {e}")
-            return False
+            if self._count_failed_logins_today(now) > self.max_failed_logins_per_day:
+                self._penalize("failed_login")
+
+        print_lg(f"[MONITOR] Login recorded: {username} ({'success' if success else 'failed'})")
+        return True
     
     def record_application(self, company: str, job_title: str, success: bool = True) -> bool:
         """
@@ -93,23 +209,49 @@ class AccountMonitor:
         Returns:
             True if recorded successfully
         """
-        try:
-            app_event = {
-                "timestamp": datetime.now().isoformat(),
-                "company": company,
-                "job_title": job_title,
-                "success": success
-            }
-            
-            self.application_history.append(app_event)
-            
-            print_lg(f"[MONITOR] Application recorded: {company} - {job_title}")
-            return True
-            
-        except Exception as e:
-            print_lg(f"[MONITOR] Error recording application: {e}")
-            return False
+        now = time.time()
+        self.application_history.append(AppEvent(now, company, job_title, success))
+        self._append_col(self._app_ts, now, 5000)
+        self._append_col(self._app_success, 1 if success else 0, 5000)
+
+        self._advance_wheels(now)
+        self._app_wheel[int(now // 60) % 60] += 1
+
+        self._log_counter += 1
+        if self._log_counter % self._log_every_n == 1:
+            print_lg(f"[MONITOR] Application recorded: {company} - {job_title} "
+                     f"({self._log_counter} total this session)")
+        return True
     
+    def record_applications_batch(self, events: List[tuple]) -> bool:
+        """
+        Record a batch of job applications in one pass.
+
+        Amortizes the clock read, wheel update and log line across the whole
+        batch, which matters when applications are ingested in bursts.
+
+        Args:
+            events: List of (company, job_title, success) tuples
+
+        Returns:
+            True if recorded successfully
+        """
+        if not events:
+            return True
+
+        now = time.time()
+        self._advance_wheels(now)
+        self._app_wheel[int(now // 60) % 60] += len(events)
+
+        for company, job_title, success in events:
+            self.application_history.append(AppEvent(now, company, job_title, success))
+            self._append_col(self._app_ts, now, 5000)
+            self._append_col(self._app_success, 1 if success else 0, 5000)
+
+        self._log_counter += len(events)
+        print_lg(f"[MONITOR] Recorded {len(events)} applications in batch")
+        return True
+
     def record_error(self, error_type: str, error_message: str, context: Dict = None) -> bool:
         """
         Record an error event.
@@ -122,27 +264,25 @@ class AccountMonitor:
         Returns:
             True if recorded successfully
         """
-        try:
-            error_event = {
-                "timestamp": datetime.now().isoformat(),
-                "error_type": error_type,
-                "message": error_message,
-                "context": context or {}
-            }
-            
-            self.error_history.append(error_event)
-            
-            # Update health score for errors
-            error_count = self._count_errors_last_hour()
-            if error_count > self.max_errors_per_hour:
-                self.health_score = max(0, self.health_score - 5)
-            
-            print_lg(f"[MONITOR] Error recorded: {error_type}")
-            return True
-            
-        except Exception as e:
-            print_lg(f"[MONITOR] Error recording error: {e}")
-            return False
+        now = time.time()
+        if len(self.error_history) == self.error_history.maxlen:
+            evicted = self.error_history[0].error_type
+            self._errors_by_type[evicted] -= 1
+            if self._errors_by_type[evicted] <= 0:
+                del self._errors_by_type[evicted]
+        self.error_history.append(ErrorEvent(now, error_type, error_message, context or {}))
+        self._errors_by_type[error_type] += 1
+        self._append_col(self._err_ts, now, 500)
+
+        self._advance_wheels(now)
+        self._error_wheel[int(now // 60) % 60] += 1
+
+        # Update health score for errors
+        if self._count_errors_last_hour(now) > self.max_errors_per_hour:
+            self._penalize("error_rate")
+
+        print_lg(f"[MONITOR] Error recorded: {error_type}")
+        return True
     
     def detect_suspicious_patterns(self) -> List[Dict]:
         """
@@ -152,63 +292,82 @@ class AccountMonitor:
             List of suspicious patterns detected
         """
         suspicious_list = []
-        
+
         try:
+            # One clock read and one wheel advance shared by all five checks
+            now = time.time()
+            now_iso = datetime.now().isoformat()
+            self._advance_wheels(now)
+            apps_per_hour = sum(self._app_wheel)
+            failed_logins = sum(self._failed_login_wheel)
+            errors_per_hour = sum(self._error_wheel)
+
+            # Single pass over last-24h logins for the time-of-day signal
+            # (pattern 5)
+            unusual_count = 0
+            for e in self._recent(self.login_history, self._login_ts, now - 86400):
+                if e.success and datetime.fromtimestamp(e.ts).hour < 5:
+                    unusual_count += 1
+
+            # Pattern 4 reads the rolling location window maintained by
+            # record_login: the latest location is unusual if it appears
+            # exactly once among the last 10
+            unusual_locations = []
+            if len(self._recent_locs) >= 2:
+                current_location = self._recent_locs[-1]
+                if self._recent_locs_count[current_location] == 1:
+                    unusual_locations.append(current_location)
+
             # Pattern 1: Burst application activity (>max per hour)
-            apps_per_hour = self._count_applications_last_hour()
             if apps_per_hour > self.max_applications_per_hour:
                 suspicious_list.append({
                     "pattern": "burst_activity",
                     "severity": "critical",
                     "description": f"{apps_per_hour} applications in last hour (threshold: {self.max_applications_per_hour})",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso
                 })
-                self.health_score = max(0, self.health_score - 15)
-            
+                self._penalize("burst_activity")
+
             # Pattern 2: Multiple failed login attempts
-            failed_logins = self._count_failed_logins_today()
             if failed_logins > self.max_failed_logins_per_day:
                 suspicious_list.append({
                     "pattern": "failed_logins",
                     "severity": "high",
                     "description": f"{failed_logins} failed logins today (threshold: {self.max_failed_logins_per_day})",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso
                 })
-                self.health_score = max(0, self.health_score - 10)
-            
+                self._penalize("failed_logins")
+
             # Pattern 3: High error rate
-            errors_per_hour = self._count_errors_last_hour()
             if errors_per_hour > self.max_errors_per_hour:
                 suspicious_list.append({
                     "pattern": "error_spike",
                     "severity": "high",
                     "description": f"{errors_per_hour} errors in last hour (threshold: {self.max_errors_per_hour})",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso
                 })
-                self.health_score = max(0, self.health_score - 10)
-            
+                self._penalize("error_spike")
+
             # Pattern 4: Login from unusual location
-            unusual_locations = self._detect_unusual_locations()
             if unusual_locations:
                 suspicious_list.append({
                     "pattern": "unusual_location",
                     "severity": "medium",
                     "description": f"Login from new location(s): {', '.join(unusual_locations)}",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso
                 })
-                self.health_score = max(0, self.health_score - 5)
-            
+                self._penalize("unusual_location")
+
             # Pattern 5: Unusual login times (late night/early morning)
-            unusual_times = self._detect_unusual_times()
-            if unusual_times:
+            if unusual_count > 0:
                 suspicious_list.append({
                     "pattern": "unusual_time",
                     "severity": "low",
-                    "description": f"Login at unusual times: {unusual_times}",
-                    "timestamp": datetime.now().isoformat()
+                    "description": f"Login at unusual times: {unusual_count} logins between 12 AM - 5 AM",
+                    "timestamp": now_iso
                 })
-                self.health_score = max(0, self.health_score - 3)
-            
+                self._penalize("unusual_time")
+
             # Log critical patterns
             for pattern in suspicious_list:
                 if pattern['severity'] in ['critical', 'high']:
@@ -228,9 +387,18 @@ class AccountMonitor:
             Dict with health status and metrics
         """
         try:
+            now_ts = time.time()
+            cache_key = (len(self.login_history), len(self.application_history),
+                         len(self.error_history), self.health_score)
+            if (self._health_cache is not None and self._health_cache_key == cache_key
+                    and now_ts - self._health_cache_at < 1.0):
+                return self._health_cache
+
+            # One clock snapshot shared by every helper below
             now = datetime.now()
             uptime = (now - self.startup_time).total_seconds()
-            
+            logins_today, logins_failed_today = self._login_stats_today(now_ts)
+
             # Normalize health score to 0-100
             health_score = max(0, min(100, self.health_score))
             
@@ -242,7 +410,7 @@ class AccountMonitor:
             else:
                 status = "CRITICAL"
             
-            return {
+            status_report = {
                 "timestamp": now.isoformat(),
                 "health_score": health_score,
                 "status": status,
@@ -251,14 +419,19 @@ class AccountMonitor:
                     "total_logins": len(self.login_history),
                     "total_applications": len(self.application_history),
                     "total_errors": len(self.error_history),
-                    "logins_today": self._count_logins_today(),
-                    "logins_failed_today": self._count_failed_logins_today(),
-                    "applications_last_hour": self._count_applications_last_hour(),
-                    "errors_last_hour": self._count_errors_last_hour()
+                    "logins_today": logins_today,
+                    "logins_failed_today": logins_failed_today,
+                    "applications_last_hour": self._count_applications_last_hour(now_ts),
+                    "errors_last_hour": self._count_errors_last_hour(now_ts)
                 },
                 "last_update": self.last_health_check.isoformat()
             }
-            
+
+            self._health_cache = status_report
+            self._health_cache_key = cache_key
+            self._health_cache_at = now_ts
+            return status_report
+
         except Exception as e:
             print_lg(f"[MONITOR] Error getting health status: {e}")
             return {"status": "ERROR", "error": str(e)}
@@ -274,42 +447,47 @@ class AccountMonitor:
             Dict with activity summary
         """
         try:
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            
-            # Filter recent activities
-            recent_logins = [e for e in self.login_history 
-                           if datetime.fromisoformat(e['timestamp']) >= cutoff_time]
-            recent_apps = [e for e in self.application_history 
-                          if datetime.fromisoformat(e['timestamp']) >= cutoff_time]
-            recent_errors = [e for e in self.error_history 
-                            if datetime.fromisoformat(e['timestamp']) >= cutoff_time]
-            
-            # Calculate statistics
-            successful_apps = sum(1 for a in recent_apps if a.get('success', True))
-            failed_apps = len(recent_apps) - successful_apps
-            successful_logins = sum(1 for l in recent_logins if l['success'])
-            failed_logins = len(recent_logins) - successful_logins
-            
-            # Group errors by type
-            errors_by_type = {}
-            for error in recent_errors:
-                error_type = error['error_type']
-                errors_by_type[error_type] = errors_by_type.get(error_type, 0) + 1
-            
+            cutoff_ts = time.time() - hours * 3600
+
+            # Counts come straight from the SoA columns: bisect for the
+            # window start, then sum the success-flag suffix (C-level loop).
+            # The lazily-trimmed columns may retain entries the deques have
+            # already evicted, so the index is clamped past that stale prefix
+            login_idx = max(bisect_left(self._login_ts, cutoff_ts),
+                            len(self._login_ts) - len(self.login_history))
+            total_logins = len(self._login_ts) - login_idx
+            successful_logins = self._sum_flags(self._login_success, login_idx)
+
+            app_idx = max(bisect_left(self._app_ts, cutoff_ts),
+                          len(self._app_ts) - len(self.application_history))
+            total_apps = len(self._app_ts) - app_idx
+            successful_apps = self._sum_flags(self._app_success, app_idx)
+
+            # Error grouping: the running counter covers everything still
+            # retained, so the common case (window spans the whole history)
+            # is a dict copy; narrower windows group the bisected suffix only
+            if not self.error_history or self.error_history[0].ts >= cutoff_ts:
+                total_errors = len(self.error_history)
+                errors_by_type = dict(self._errors_by_type)
+            else:
+                recent_errors = self._recent(self.error_history, self._err_ts, cutoff_ts)
+                total_errors = len(recent_errors)
+                errors_by_type = dict(Counter(map(attrgetter('error_type'), recent_errors)))
+
             return {
                 "time_period_hours": hours,
                 "logins": {
-                    "total": len(recent_logins),
+                    "total": total_logins,
                     "successful": successful_logins,
-                    "failed": failed_logins
+                    "failed": total_logins - successful_logins
                 },
                 "applications": {
-                    "total": len(recent_apps),
+                    "total": total_apps,
                     "successful": successful_apps,
-                    "failed": failed_apps
+                    "failed": total_apps - successful_apps
                 },
                 "errors": {
-                    "total": len(recent_errors),
+                    "total": total_errors,
                     "by_type": errors_by_type
                 }
             }
@@ -319,78 +497,95 @@ class AccountMonitor:
             return {"error": str(e)}
     
     # Private helper methods
-    
-    def _count_logins_today(self) -> int:
+
+    def _penalize(self, kind: str):
+        """Apply the clamped health-score deduction for a detected condition."""
+        self.health_score = max(0, self.health_score - self.PENALTIES[kind])
+
+    @staticmethod
+    def _append_col(col, value, maxlen: int):
+        """Append to a SoA column, trimming lazily to bound memory."""
+        col.append(value)
+        if len(col) > 2 * maxlen:
+            del col[:-maxlen]
+
+    @staticmethod
+    def _sum_flags(flags, start: int) -> int:
+        """
+        Sum a success-flag column suffix. Prefers the numba-compiled kernel
+        over a NumPy zero-copy view, then the plain vectorized sum, then the
+        builtin sum over the typed array.
+        """
+        if NUMPY_AVAILABLE and len(flags) - start > 64:
+            view = np.frombuffer(flags, dtype=np.int8)
+            if NUMBA_AVAILABLE:
+                return int(sum_flags_from(view, start))
+            return int(view[start:].sum())
+        return sum(flags[start:])
+
+    @staticmethod
+    def _recent(history: deque, ts_list, cutoff: float) -> list:
+        """
+        Return events newer than cutoff by bisecting the parallel timestamp
+        column instead of testing every event. The column may retain a few
+        entries older than the deque; the offset realigns indices.
+        """
+        idx = bisect_left(ts_list, cutoff)
+        offset = len(ts_list) - len(history)
+        return list(islice(history, max(0, idx - offset), None))
+
+    def _advance_wheels(self, now: float):
+        """Zero out wheel slots that expired since the last recorded tick."""
+        tick = int(now)
+        last = self._wheel_tick
+        if tick <= last:
+            return
+
+        last_min, cur_min = last // 60, tick // 60
+        if cur_min != last_min:
+            for i in range(1, min(cur_min - last_min, 60) + 1):
+                idx = (last_min + i) % 60
+                self._app_wheel[idx] = 0
+                self._error_wheel[idx] = 0
+
+        last_hour, cur_hour = last // 3600, tick // 3600
+        if cur_hour != last_hour:
+            for i in range(1, min(cur_hour - last_hour, 24) + 1):
+                idx = (last_hour + i) % 24
+                self._login_wheel[idx] = 0
+                self._failed_login_wheel[idx] = 0
+
+        self._wheel_tick = tick
+
+    def _login_stats_today(self, now: float = None) -> tuple:
+        """Return (total, failed) logins for the last 24 hours in one pass."""
+        self._advance_wheels(now if now is not None else time.time())
+        return sum(self._login_wheel), sum(self._failed_login_wheel)
+
+    def _count_logins_today(self, now: float = None) -> int:
         """Count total logins in the last 24 hours."""
-        cutoff = datetime.now() - timedelta(hours=24)
-        return sum(1 for e in self.login_history 
-                  if datetime.fromisoformat(e['timestamp']) >= cutoff)
-    
-    def _count_failed_logins_today(self) -> int:
+        return self._login_stats_today(now)[0]
+
+    def _count_failed_logins_today(self, now: float = None) -> int:
         """Count failed logins in the last 24 hours."""
-        cutoff = datetime.now() - timedelta(hours=24)
-        return sum(1 for e in self.login_history 
-                  if not e['success'] and datetime.fromisoformat(e['timestamp']) >= cutoff)
-    
-    def _count_applications_last_hour(self) -> int:
+        return self._login_stats_today(now)[1]
+
+    def _count_applications_last_hour(self, now: float = None) -> int:
         """Count applications in the last hour."""
-        cutoff = datetime.now() - timedelta(hours=1)
-        return sum(1 for e in self.application_history 
-                  if datetime.fromisoformat(e['timestamp']) >= cutoff)
-    
-    def _count_errors_last_hour(self) -> int:
+        self._advance_wheels(now if now is not None else time.time())
+        return sum(self._app_wheel)
+
+    def _count_errors_last_hour(self, now: float = None) -> int:
         """Count errors in the last hour."""
-        cutoff = datetime.now() - timedelta(hours=1)
-        return sum(1 for e in self.error_history 
-                  if datetime.fromisoformat(e['timestamp']) >= cutoff)
-    
-    def _detect_unusual_locations(self) -> List[str]:
-        """Detect logins from unusual locations."""
-        unusual = []
-        
-        if len(self.login_history) < 2:
-            return unusual
-        
-        recent_logins = list(self.login_history)[-10:]  # Last 10 logins
-        locations = [e.get('location') for e in recent_logins 
-                    if e.get('location') and e['success']]
-        
-        if locations:
-            current_location = locations[-1]
-            previous_locations = locations[:-1]
-            
-            # If current location differs from all previous ones in the period
-            if current_location not in previous_locations and current_location:
-                unusual.append(current_location)
-        
-        return unusual
-    
-    def _detect_unusual_times(self) -> str:
-        """Detect logins at unusual times (0-5 AM)."""
-        unusual_count = 0
-        
-        cutoff = datetime.now() - timedelta(hours=24)
-        recent_logins = [e for e in self.login_history 
-                        if datetime.fromisoformat(e['timestamp']) >= cutoff and e['success']]
-        
-        for login in recent_logins:
-            login_time = datetime.fromisoformat(login['timestamp'])
-            hour = login_time.hour
-            
-            # Unusual hours: midnight to 5 AM
-            if 0 <= hour < 5:
-                unusual_count += 1
-        
-        if unusual_count > 0:
-            return f"{unusual_count} logins between 12 AM - 5 AM"
-        
-        return ""
+        self._advance_wheels(now if now is not None else time.time())
+        return sum(self._error_wheel)
     
     def reset_health_score(self) -> bool:
         """Reset health score to 100."""
         try:
             self.health_score = 100
             self.last_health_check = datetime.now()
+            self._health_cache = None
             print_lg("[MONITOR] Health score reset to 100")
             return True
         except Exception as e:
@@ -408,21 +603,36 @@ class AccountMonitor:
             True if exported successfully
         """
         try:
-            data = {
-                "export_timestamp": datetime.now().isoformat(),
-                "health_status": self.get_health_status(),
-                "activity_summary": self.get_activity_summary(24),
-                "login_history": list(self.login_history),
-                "application_history": list(self.application_history),
-                "error_history": list(self.error_history)
-            }
-            
+            dumps = json.dumps
+            compact = (',', ':')
+
+            def write_history(f, history):
+                # Stream one event at a time instead of materializing the
+                # whole history; the ISO timestamp is attached per event
+                f.write('[')
+                for i, e in enumerate(history):
+                    if i:
+                        f.write(',')
+                    record = e.to_dict()
+                    record["timestamp"] = datetime.fromtimestamp(e.ts).isoformat()
+                    f.write(dumps(record, separators=compact))
+                f.write(']')
+
             with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
-            
+                f.write('{"export_timestamp":%s,' % dumps(datetime.now().isoformat()))
+                f.write('"health_status":%s,' % dumps(self.get_health_status(), separators=compact))
+                f.write('"activity_summary":%s,' % dumps(self.get_activity_summary(24), separators=compact))
+                f.write('"login_history":')
+                write_history(f, self.login_history)
+                f.write(',"application_history":')
+                write_history(f, self.application_history)
+                f.write(',"error_history":')
+                write_history(f, self.error_history)
+                f.write('}')
+
             print_lg(f"[MONITOR] Exported monitoring data to {filepath}")
             return True
-            
+
         except Exception as e:
             print_lg(f"[MONITOR] Error exporting monitoring data: {e}")
             return False
@@ -455,7 +665,8 @@ class AccountMonitor:
     def get_stats(self) -> Dict:
         """Get audit statistics."""
         total_logins = len(self.login_history)
-        successful_logins = sum(1 for e in self.login_history if e['success'])
+        # bools sum as ints; map+attrgetter does one C-level slot load per event
+        successful_logins = sum(map(attrgetter('success'), self.login_history))
         failed_logins = total_logins - successful_logins
         
         return {
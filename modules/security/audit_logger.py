@@ -6,9 +6,52 @@ Logs all security-relevant events for monitoring and compliance
 import json
 import os
 import csv
+import queue
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from modules.helpers import print_lg
+from modules.security._timefmt import now_iso
+from modules.security._uring_writer import URING_AVAILABLE, UringWriter
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+def _dumps_line(event: Dict) -> bytes:
+    """Serialize one event to a newline-terminated JSON line (bytes)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(event).encode() + b'\n'
+
+
+def _loads(raw: bytes) -> Dict:
+    """Deserialize one stored event line back to a dict."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _make_credential_logger(event_type: str, severity: str):
+    """Build a log_* helper for the credential events, which all share the
+    same shape; event type and severity are bound once at class creation
+    instead of being re-decided on every call."""
+    def helper(self, credential_name: str, username: str = "system") -> bool:
+        return self.log_event(event_type, {"credential": credential_name},
+                              username, severity)
+    helper.__name__ = f"log_{event_type}"
+    helper.__doc__ = f"Log a {event_type} event."
+    return helper
 
 
 class AuditLogger:
@@ -44,22 +87,63 @@ class AuditLogger:
         "high": 3,
         "critical": 4
     }
+    SEVERITY_NAMES = {v: k for k, v in SEVERITY_LEVELS.items()}
     
-    def __init__(self, log_dir: str = "logs/security"):
+    def __init__(self, log_dir: str = "logs/security", log_format: str = "jsonl",
+                 max_in_memory: int = 10_000):
         """
         Initialize audit logger.
         
         Args:
             log_dir: Directory to store audit logs
+            log_format: On-disk format - "jsonl" (default, readable) or
+                        "msgpack" (smaller/faster, needs the msgpack package)
+            max_in_memory: Events kept in memory for queries; the log file
+                           on disk remains the complete record
         """
+        if log_format == "msgpack" and not MSGPACK_AVAILABLE:
+            print_lg("[AUDIT] msgpack not installed, falling back to jsonl format")
+            log_format = "jsonl"
+        self.log_format = log_format
+        self.max_in_memory = max_in_memory
         self.log_dir = log_dir
-        self.log_file = os.path.join(log_dir, "audit.log")
-        self.events_in_memory = []
+        ext = "mpk" if log_format == "msgpack" else "log"
+        self.log_file = os.path.join(log_dir, f"audit.{ext}")
+
+        # Events are serialized exactly once; the bytes line written to disk
+        # is also what is kept in memory, next to small parallel columns of
+        # the filterable fields so queries scan strings instead of dicts.
+        self._raw = []         # newline-terminated JSON lines (bytes)
+        self._types = []       # event_type per event
+        self._sev = array('b')  # severity code per event (1 byte each)
+        self._users = []       # username per event
+        self._timestamps = []  # ISO timestamp per event (sorted, append-only)
+
+        # Running counters so get_statistics never rescans the columns;
+        # they stay all-time even after the columns are trimmed
+        self._stats = {"total": 0, "by_type": Counter(), "by_severity": Counter(),
+                       "users": set(), "critical": 0}
         
         # Create log directory if it doesn't exist
         os.makedirs(log_dir, exist_ok=True)
-        
-        print_lg("[AUDIT] Initialized Audit Logger")
+
+        # One persistent append handle instead of open/write/close per event;
+        # the 64 KiB buffer coalesces small writes and the lock keeps lines
+        # intact if events arrive from multiple threads.
+        self._write_lock = threading.Lock()
+        self._fh = open(self.log_file, 'ab', buffering=1 << 16)
+        self._uring = self._make_uring()
+
+        # Unbuffered fd for critical events: one os.write + fsync puts the
+        # record on disk without going through Python's buffered layer
+        self._raw_fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+
+        # Non-critical events go through a queue drained by a daemon thread
+        # in batches, so bursty logging pays one writelines() per batch
+        # instead of one write per event. Critical events bypass the queue.
+        self._queue = queue.Queue()
+        self._flusher = threading.Thread(target=self._drain, daemon=True)
+        self._flusher.start()
         
         print_lg("[AUDIT] Initialized Audit Logger")
     
@@ -78,39 +162,73 @@ class AuditLogger:
             True if logged successfully
         """
         try:
-            if event_type not in self.EVENT_TYPES:
+            # One .get() replaces the membership test plus the later index
+            description = _EVENT_TYPES.get(event_type)
+            if description is None:
                 print_lg(f"[AUDIT] Unknown event type: {event_type}")
                 return False
             
-            if severity not in self.SEVERITY_LEVELS:
+            sev_code = _SEVERITY_LEVELS.get(severity)
+            if sev_code is None:
                 severity = "low"
+                sev_code = _SEVERITY_LEVELS["low"]
+            is_critical = sev_code == _CRITICAL
             
             event = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "event_type": event_type,
                 "severity": severity,
                 "username": username,
-                "description": self.EVENT_TYPES[event_type],
+                "description": description,
                 "details": details or {}
             }
             
-            # Add to in-memory list
-            self.events_in_memory.append(event)
-            
-            # Write to log file
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(event) + '\n')
-            
-            # Alert on critical events
-            if severity == "critical":
-                print_lg(f"[AUDIT] ⚠️ CRITICAL: {event_type} - {details}")
-            
+            self._record(event, sev_code, is_critical)
             return True
             
         except Exception as e:
             print_lg(f"[AUDIT] Error logging event: {e}")
             return False
     
+    def _record(self, event: Dict, sev_code: int, is_critical: bool):
+        """Append an already-validated event to the columns, statistics
+        and write path."""
+        line = self._pack(event)
+
+        # Append to the in-memory columns
+        self._raw.append(line)
+        self._types.append(event["event_type"])
+        self._sev.append(sev_code)
+        self._users.append(event["username"])
+        self._timestamps.append(event["timestamp"])
+
+        # Lazy trim keeps memory bounded without shifting on every
+        # append; the sorted timestamp column stays bisectable
+        if len(self._raw) > 2 * self.max_in_memory:
+            keep = self.max_in_memory
+            del self._raw[:-keep]
+            del self._types[:-keep]
+            del self._sev[:-keep]
+            del self._users[:-keep]
+            del self._timestamps[:-keep]
+
+        self._stats["total"] += 1
+        self._stats["by_type"][event["event_type"]] += 1
+        self._stats["by_severity"][event["severity"]] += 1
+        self._stats["users"].add(event["username"])
+        if is_critical:
+            self._stats["critical"] += 1
+            # Critical events are made durable immediately: flush any
+            # buffered lines first to keep ordering, then write + fsync
+            # through the raw fd
+            with self._write_lock:
+                self._fh.flush()
+                os.write(self._raw_fd, line)
+                os.fsync(self._raw_fd)
+            print_lg(f"[AUDIT] ⚠️ CRITICAL: {event['event_type']} - {event['details']}")
+        else:
+            self._queue.put(line)
+    
     def log_login(self, username: str, success: bool, ip_address: str = None) -> bool:
         """Log a login attempt."""
         details = {
@@ -124,10 +242,8 @@ class AuditLogger:
         """Log a logout event."""
         return self.log_event("logout", {}, username, "low")
     
-    def log_credential_access(self, credential_name: str, username: str = "system") -> bool:
-        """Log credential vault access."""
-        details = {"credential": credential_name}
-        return self.log_event("credential_access", details, username, "low")
+    log_credential_access = _make_credential_logger("credential_access", "low")
+    log_credential_rotate = _make_credential_logger("credential_rotate", "medium")
     
     def log_credential_modify(self, credential_name: str, change_type: str, 
                              username: str = "system") -> bool:
@@ -135,22 +251,34 @@ class AuditLogger:
         details = {"credential": credential_name, "change_type": change_type}
         return self.log_event("credential_modify", details, username, "high")
     
-    def log_credential_rotate(self, credential_name: str, username: str = "system") -> bool:
-        """Log credential rotation."""
-        details = {"credential": credential_name}
-        return self.log_event("credential_rotate", details, username, "medium")
-    
     def log_api_call(self, api_name: str, endpoint: str, method: str = "GET",
                     status_code: int = 200, username: str = "system") -> bool:
-        """Log an API call."""
-        details = {
-            "api": api_name,
-            "endpoint": endpoint,
-            "method": method,
-            "status_code": status_code
-        }
-        severity = "low" if status_code < 400 else "medium"
-        return self.log_event("api_call", details, username, severity)
+        """Log an API call.
+        
+        Highest-frequency call site (one per HTTP request), so the event is
+        built inline and committed directly, skipping log_event's type and
+        severity validation for this trusted fixed shape.
+        """
+        try:
+            severity = "low" if status_code < 400 else "medium"
+            event = {
+                "timestamp": now_iso(),
+                "event_type": "api_call",
+                "severity": severity,
+                "username": username,
+                "description": _API_CALL_DESC,
+                "details": {
+                    "api": api_name,
+                    "endpoint": endpoint,
+                    "method": method,
+                    "status_code": status_code
+                }
+            }
+            self._record(event, _SEVERITY_LEVELS[severity], False)
+            return True
+        except Exception as e:
+            print_lg(f"[AUDIT] Error logging event: {e}")
+            return False
     
     def log_error(self, error_type: str, message: str, context: Dict = None,
                  username: str = "system") -> bool:
@@ -185,16 +313,18 @@ class AuditLogger:
         Returns:
             List of filtered events
         """
-        events = self.events_in_memory
+        indices = range(len(self._raw))
         
         if event_type:
-            events = [e for e in events if e['event_type'] == event_type]
+            indices = [i for i in indices if self._types[i] == event_type]
         if severity:
-            events = [e for e in events if e['severity'] == severity]
+            sev_code = self.SEVERITY_LEVELS.get(severity)
+            indices = [i for i in indices if self._sev[i] == sev_code]
         if username:
-            events = [e for e in events if e['username'] == username]
+            indices = [i for i in indices if self._users[i] == username]
         
-        return events[-limit:]
+        # Decode only the events that made it through the filters
+        return [self._unpack(self._raw[i]) for i in indices[-limit:]]
     
     def get_events_by_date(self, start_date: str = None, end_date: str = None,
                           limit: int = 100) -> List[Dict]:
@@ -209,20 +339,20 @@ class AuditLogger:
         Returns:
             List of events in date range
         """
-        events = self.events_in_memory
+        # The timestamp column is append-only and ISO strings sort
+        # chronologically, so the range is found by binary search
+        lo = bisect_left(self._timestamps, start_date) if start_date else 0
+        hi = bisect_right(self._timestamps, end_date) if end_date else len(self._timestamps)
         
-        if start_date:
-            events = [e for e in events if e['timestamp'] >= start_date]
-        if end_date:
-            events = [e for e in events if e['timestamp'] <= end_date]
-        
-        return events[-limit:]
+        return [self._unpack(raw) for raw in self._raw[max(lo, hi - limit):hi]]
     
     def get_critical_events(self, hours: int = 24) -> List[Dict]:
         """Get critical events from the last N hours."""
         cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
-        return [e for e in self.events_in_memory 
-                if e['severity'] == 'critical' and e['timestamp'] >= cutoff_time]
+        critical = self.SEVERITY_LEVELS["critical"]
+        lo = bisect_left(self._timestamps, cutoff_time)
+        return [self._unpack(self._raw[i]) for i in range(lo, len(self._raw))
+                if self._sev[i] == critical]
     
     def export_logs(self, filepath: str, format: str = "json") -> bool:
         """
@@ -237,21 +367,35 @@ class AuditLogger:
         """
         try:
             if format == "json":
-                with open(filepath, 'w') as f:
-                    json.dump(self.events_in_memory, f, indent=2)
+                # Stream the already-serialized lines into a JSON array so
+                # export memory stays flat regardless of log size
+                with open(filepath, 'wb') as f:
+                    f.write(b'[')
+                    for i, raw in enumerate(self._raw):
+                        if i:
+                            f.write(b',\n')
+                        if self.log_format == "msgpack":
+                            # Re-encode msgpack records as JSON for export
+                            f.write(_dumps_line(self._unpack(raw)).rstrip(b'\n'))
+                        else:
+                            f.write(raw.rstrip(b'\n'))
+                    f.write(b']')
             elif format == "csv":
-                if not self.events_in_memory:
+                if not self._raw:
                     return False
                 
-                keys = self.events_in_memory[0].keys()
+                first = self._unpack(self._raw[0])
                 with open(filepath, 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=keys)
+                    writer = csv.DictWriter(f, fieldnames=first.keys())
                     writer.writeheader()
-                    writer.writerows(self.events_in_memory)
+                    writer.writerow(first)
+                    # Decode and write one row at a time
+                    for raw in self._raw[1:]:
+                        writer.writerow(self._unpack(raw))
             else:
                 return False
             
-            print_lg(f"[AUDIT] Exported {len(self.events_in_memory)} events to {filepath}")
+            print_lg(f"[AUDIT] Exported {len(self._raw)} events to {filepath}")
             return True
             
         except Exception as e:
@@ -271,14 +415,28 @@ class AuditLogger:
         try:
             cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
             
-            # Filter in-memory events
-            self.events_in_memory = [e for e in self.events_in_memory 
-                                     if e['timestamp'] >= cutoff_date]
+            # Keep the suffix of every column from the cutoff onwards
+            lo = bisect_left(self._timestamps, cutoff_date)
+            self._raw = self._raw[lo:]
+            self._types = self._types[lo:]
+            self._sev = self._sev[lo:]
+            self._users = self._users[lo:]
+            self._timestamps = self._timestamps[lo:]
+            self._recompute_stats()
             
-            # Recreate log file with remaining events
-            with open(self.log_file, 'w') as f:
-                for event in self.events_in_memory:
-                    f.write(json.dumps(event) + '\n')
+            # Recreate log file with remaining events, then reopen the
+            # append handle on the rewritten file
+            self._queue.join()
+            with self._write_lock:
+                self._fh.close()
+                if self._uring is not None:
+                    self._uring.close()
+                os.close(self._raw_fd)
+                with open(self.log_file, 'wb') as f:
+                    f.writelines(self._raw)
+                self._fh = open(self.log_file, 'ab', buffering=1 << 16)
+                self._uring = self._make_uring()
+                self._raw_fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
             
             print_lg(f"[AUDIT] Cleared logs older than {days} days")
             return True
@@ -287,6 +445,79 @@ class AuditLogger:
             print_lg(f"[AUDIT] Error clearing old logs: {e}")
             return False
     
+    def _pack(self, event: Dict) -> bytes:
+        """Serialize one event in the configured on-disk format."""
+        if self.log_format == "msgpack":
+            return msgpack.packb(event)
+        return _dumps_line(event)
+
+    def _unpack(self, raw: bytes) -> Dict:
+        """Deserialize one stored event record."""
+        if self.log_format == "msgpack":
+            return msgpack.unpackb(raw)
+        return _loads(raw)
+
+    def _make_uring(self):
+        """Build an io_uring batch writer for the log fd, if available."""
+        if not URING_AVAILABLE:
+            return None
+        try:
+            return UringWriter(self._fh.fileno())
+        except Exception as e:
+            print_lg(f"[AUDIT] io_uring unavailable, using buffered writes: {e}")
+            return None
+
+    def _drain(self):
+        """Background flusher: batch queued lines into single writes."""
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < 512:
+                    batch.append(self._queue.get(timeout=0.05))
+            except queue.Empty:
+                pass
+            # A failed write must not kill the flusher thread or leave the
+            # batch unacknowledged - flush()/close() join() the queue and
+            # would hang forever on the missing task_done calls
+            try:
+                with self._write_lock:
+                    if self._uring is not None:
+                        # Hand the whole batch to the ring in one submit
+                        self._fh.flush()
+                        self._uring.write_batch(batch)
+                    else:
+                        self._fh.writelines(batch)
+            except Exception as e:
+                print_lg(f"[AUDIT] Error writing audit batch: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self) -> None:
+        """Wait for queued events to be written and flush to disk."""
+        self._queue.join()
+        with self._write_lock:
+            if not self._fh.closed:
+                self._fh.flush()
+
+    def close(self) -> None:
+        """Drain the queue, then flush and close the log file handle."""
+        self._queue.join()
+        with self._write_lock:
+            if not self._fh.closed:
+                if self._uring is not None:
+                    self._uring.close()
+                    self._uring = None
+                self._fh.flush()
+                self._fh.close()
+                os.close(self._raw_fd)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def get_statistics(self) -> Dict:
         """
         Get audit log statistics.
@@ -294,28 +525,23 @@ class AuditLogger:
         Returns:
             Dict with log statistics
         """
-        stats = {
-            "total_events": len(self.events_in_memory),
-            "events_by_type": {},
-            "events_by_severity": {},
-            "users_logged": set(),
-            "critical_events": 0
+        return {
+            "total_events": self._stats["total"],
+            "events_by_type": dict(self._stats["by_type"]),
+            "events_by_severity": dict(self._stats["by_severity"]),
+            "users_logged": list(self._stats["users"]),
+            "critical_events": self._stats["critical"]
         }
-        
-        for event in self.events_in_memory:
-            event_type = event['event_type']
-            severity = event['severity']
-            username = event['username']
-            
-            stats["events_by_type"][event_type] = stats["events_by_type"].get(event_type, 0) + 1
-            stats["events_by_severity"][severity] = stats["events_by_severity"].get(severity, 0) + 1
-            stats["users_logged"].add(username)
-            
-            if severity == "critical":
-                stats["critical_events"] += 1
-        
-        stats["users_logged"] = list(stats["users_logged"])
-        return stats
+
+    def _recompute_stats(self):
+        """Rebuild the running statistics counters from the columns."""
+        stats = {"total": len(self._raw),
+                 "by_type": Counter(self._types), "by_severity": Counter(),
+                 "users": set(self._users), "critical": 0}
+        for sev_code in self._sev:
+            stats["by_severity"][self.SEVERITY_NAMES[sev_code]] += 1
+        stats["critical"] = stats["by_severity"]["critical"]
+        self._stats = stats
     
     def health_check(self) -> Dict:
         """
@@ -327,7 +553,7 @@ class AuditLogger:
         try:
             log_file_exists = os.path.exists(self.log_file)
             log_file_size = os.path.getsize(self.log_file) if log_file_exists else 0
-            events_in_memory = len(self.events_in_memory)
+            events_in_memory = len(self._raw)
             
             return {
                 "status": "healthy",
@@ -341,3 +567,10 @@ class AuditLogger:
                 "status": "unhealthy",
                 "error": str(e)
             }
+
+
+# Module-level bindings for the lookups on log_event's hot path
+_EVENT_TYPES = AuditLogger.EVENT_TYPES
+_SEVERITY_LEVELS = AuditLogger.SEVERITY_LEVELS
+_CRITICAL = _SEVERITY_LEVELS["critical"]
+_API_CALL_DESC = _EVENT_TYPES["api_call"]
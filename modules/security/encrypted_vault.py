@@ -3,19 +3,33 @@ Encrypted Vault - Secure credential storage
 Encrypts sensitive credentials using Fernet (symmetric encryption)
 """
 
+import base64
+import mmap
 import os
 import json
+import time
 from typing import Dict, Optional
+from collections import deque
 from datetime import datetime
 from modules.helpers import print_lg
+from modules.security._timefmt import now_iso
 
 try:
     from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
     CRYPTO_AVAILABLE = True
 except ImportError:
     CRYPTO_AVAILABLE = False
     print_lg("[WARNING] cryptography library not installed. Install with: pip install cryptography")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class EncryptedVault:
     """
@@ -29,6 +43,9 @@ class EncryptedVault:
     - Audit trail of access
     """
     
+    # How long a decrypted value may be served from cache
+    DECRYPT_CACHE_TTL = 60.0
+    
     def __init__(self, vault_file: str = "config/.vault", master_password: str = None):
         """
         Initialize encrypted vault.
@@ -40,7 +57,13 @@ class EncryptedVault:
         self.vault_file = vault_file
         self.credentials = {}
         self.cipher = None
-        self.access_log = []
+        self._aead = None
+        self._log_fh = None  # append-only op log, opened on first write
+        # Short-TTL cache of decrypted values so hot credentials don't pay
+        # the cipher cost on every lookup; invalidated on set/delete
+        self._dec_cache = {}
+        # Bounded so long-running vaults don't grow the trail indefinitely
+        self.access_log = deque(maxlen=1024)
         
         if not CRYPTO_AVAILABLE:
             print_lg("[VAULT] WARNING: Cryptography not available, using plaintext storage (INSECURE)")
@@ -49,8 +72,8 @@ class EncryptedVault:
         # Get or create encryption key
         self._initialize_cipher(master_password)
         
-        # Load existing vault if it exists
-        if os.path.exists(vault_file):
+        # Load existing vault (snapshot and/or op log) if it exists
+        if os.path.exists(vault_file) or os.path.exists(vault_file + ".log"):
             self._load_vault()
         
         print_lg(f"[VAULT] Initialized encrypted vault at {vault_file}")
@@ -75,10 +98,22 @@ class EncryptedVault:
                 print_lg("[VAULT] WARNING: No master password provided, using default (INSECURE)")
                 master_password = "default-insecure-password-change-this"
             
-            # Derive key from password (simplified - in production use PBKDF2)
-            import hashlib
-            key = Fernet.encrypt(master_password.encode()).rstrip(b'=')[:32]
-            key = Fernet.generate_key()  # Use proper random key instead
+            # Derive the key from the password with PBKDF2-HMAC-SHA256
+            # over a persisted random salt
+            salt_file = self.vault_file + ".salt"
+            if os.path.exists(salt_file):
+                with open(salt_file, 'rb') as f:
+                    salt = f.read()
+            else:
+                salt = os.urandom(16)
+                os.makedirs(os.path.dirname(salt_file), exist_ok=True)
+                with open(salt_file, 'wb') as f:
+                    f.write(salt)
+                os.chmod(salt_file, 0o600)
+            
+            kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32,
+                             salt=salt, iterations=600_000)
+            key = base64.urlsafe_b64encode(kdf.derive(master_password.encode()))
             
             # Save key file (protect with file permissions)
             os.makedirs(os.path.dirname(key_file), exist_ok=True)
@@ -87,6 +122,9 @@ class EncryptedVault:
             os.chmod(key_file, 0o600)  # Read/write owner only
         
         self.cipher = Fernet(key)
+        # AES-GCM shares the same 32 raw key bytes; it authenticates in the
+        # cipher itself, so new records skip Fernet's HMAC and double base64
+        self._aead = AESGCM(base64.urlsafe_b64decode(key))
     
     def set_credential(self, name: str, value: str, metadata: Dict = None) -> bool:
         """
@@ -101,6 +139,7 @@ class EncryptedVault:
             True if successful
         """
         try:
+            self._dec_cache.pop(name, None)
             if not CRYPTO_AVAILABLE:
                 # Fallback: store in plaintext (insecure)
                 self.credentials[name] = {
@@ -109,20 +148,23 @@ class EncryptedVault:
                     "created": datetime.now().isoformat(),
                     "encrypted": False
                 }
-                self._save_vault()
+                self._append_op({"op": "set", "name": name, "record": self.credentials[name]})
                 return True
             
-            # Encrypt value
-            encrypted_value = self.cipher.encrypt(value.encode()).decode()
+            # Encrypt value (nonce is prepended to the ciphertext)
+            nonce = os.urandom(12)
+            ciphertext = self._aead.encrypt(nonce, value.encode(), None)
+            encrypted_value = base64.b64encode(nonce + ciphertext).decode()
             
             self.credentials[name] = {
                 "value": encrypted_value,
+                "cipher": "aesgcm",
                 "metadata": metadata or {},
                 "created": datetime.now().isoformat(),
                 "encrypted": True
             }
             
-            self._save_vault()
+            self._append_op({"op": "set", "name": name, "record": self.credentials[name]})
             print_lg(f"[VAULT] Stored credential: {name}")
             return True
             
@@ -144,22 +186,36 @@ class EncryptedVault:
             if name not in self.credentials:
                 print_lg(f"[VAULT] Credential not found: {name}")
                 return None
-            
+
             cred_data = self.credentials[name]
-            
-            # Check if credential is expired
+
+            # Check if credential is expired - before the decrypt cache, so
+            # a cached value can't outlive its expiry by the cache TTL
             if "metadata" in cred_data and "expires" in cred_data["metadata"]:
                 expires = cred_data["metadata"]["expires"]
                 if expires < datetime.now().isoformat():
                     print_lg(f"[VAULT] WARNING: Credential expired: {name}")
+                    self._dec_cache.pop(name, None)
                     return None
-            
-            # Decrypt if necessary
+
+            cached = self._dec_cache.get(name)
+            if cached is not None and time.time() - cached[1] < self.DECRYPT_CACHE_TTL:
+                self._log_access(name, "get")
+                return cached[0]
+
+            # Decrypt if necessary (records without a cipher tag predate
+            # AES-GCM and were written by Fernet)
             if cred_data.get("encrypted", False) and CRYPTO_AVAILABLE:
-                decrypted = self.cipher.decrypt(cred_data["value"].encode()).decode()
+                if cred_data.get("cipher") == "aesgcm":
+                    blob = base64.b64decode(cred_data["value"])
+                    decrypted = self._aead.decrypt(blob[:12], blob[12:], None).decode()
+                else:
+                    decrypted = self.cipher.decrypt(cred_data["value"].encode()).decode()
             else:
                 decrypted = cred_data["value"]
             
+            self._dec_cache[name] = (decrypted, time.time())
+            
             # Log access
             self._log_access(name, "get")
             
@@ -182,7 +238,8 @@ class EncryptedVault:
         try:
             if name in self.credentials:
                 del self.credentials[name]
-                self._save_vault()
+                self._dec_cache.pop(name, None)
+                self._append_op({"op": "del", "name": name})
                 self._log_access(name, "delete")
                 print_lg(f"[VAULT] Deleted credential: {name}")
                 return True
@@ -207,8 +264,40 @@ class EncryptedVault:
             for name, data in self.credentials.items()
         }
     
+    def _append_op(self, op: Dict) -> bool:
+        """Append one set/del operation to the vault op log.
+        
+        Updates rewrite a single line instead of the whole vault; the
+        snapshot file is only rewritten when the log is compacted.
+        """
+        try:
+            if self._log_fh is None:
+                log_path = self.vault_file + ".log"
+                os.makedirs(os.path.dirname(log_path), exist_ok=True)
+                self._log_fh = open(log_path, 'a')
+                os.chmod(log_path, 0o600)
+            self._log_fh.write(json.dumps(op) + '\n')
+            self._log_fh.flush()
+            self._maybe_compact()
+            return True
+        except Exception as e:
+            print_lg(f"[VAULT] Error writing vault log: {e}")
+            return False
+    
+    def _maybe_compact(self):
+        """Fold the op log into the snapshot once it outgrows it."""
+        log_path = self.vault_file + ".log"
+        snapshot_size = os.path.getsize(self.vault_file) if os.path.exists(self.vault_file) else 0
+        if os.path.getsize(log_path) > 10 * max(snapshot_size, 4096):
+            # Only discard the log once the snapshot actually landed;
+            # otherwise it is the sole record of recent set/del operations
+            if self._save_vault():
+                self._log_fh.close()
+                self._log_fh = open(log_path, 'w')
+                os.chmod(log_path, 0o600)
+    
     def _save_vault(self) -> bool:
-        """Save encrypted credentials to file."""
+        """Write the full credentials snapshot to file."""
         try:
             os.makedirs(os.path.dirname(self.vault_file), exist_ok=True)
             with open(self.vault_file, 'w') as f:
@@ -220,10 +309,32 @@ class EncryptedVault:
             return False
     
     def _load_vault(self) -> bool:
-        """Load encrypted credentials from file."""
+        """Load the snapshot, then replay the op log on top of it."""
         try:
-            with open(self.vault_file, 'r') as f:
-                self.credentials = json.load(f)
+            if os.path.exists(self.vault_file) and os.path.getsize(self.vault_file):
+                with open(self.vault_file, 'rb') as f:
+                    if ORJSON_AVAILABLE:
+                        # orjson parses straight out of the mapped pages,
+                        # skipping the read-into-a-string copy
+                        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        try:
+                            self.credentials = orjson.loads(memoryview(mapped))
+                        finally:
+                            mapped.close()
+                    else:
+                        self.credentials = json.load(f)
+            
+            loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+            log_path = self.vault_file + ".log"
+            if os.path.exists(log_path):
+                with open(log_path, 'rb') as f:
+                    for line in f:
+                        op = loads(line)
+                        if op["op"] == "set":
+                            self.credentials[op["name"]] = op["record"]
+                        elif op["op"] == "del":
+                            self.credentials.pop(op["name"], None)
+            
             print_lg(f"[VAULT] Loaded {len(self.credentials)} credentials from vault")
             return True
         except Exception as e:
@@ -233,14 +344,14 @@ class EncryptedVault:
     def _log_access(self, credential_name: str, action: str):
         """Log credential access for audit trail."""
         self.access_log.append({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "credential": credential_name,
             "action": action
         })
     
     def get_access_log(self) -> list:
         """Get access audit trail."""
-        return self.access_log.copy()
+        return list(self.access_log)
     
     def health_check(self) -> Dict:
         """
@@ -255,5 +366,5 @@ class EncryptedVault:
             "key_file_exists": os.path.exists(self.vault_file + ".key"),
             "credentials_count": len(self.credentials),
             "access_log_size": len(self.access_log),
-            "cipher_initialized": self.cipher is not None
+            "cipher_initialized": self._aead is not None
         }
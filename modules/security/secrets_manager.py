@@ -3,7 +3,10 @@ Secrets Manager - Automated credential rotation
 Handles periodic rotation of API keys, tokens, and passwords
 """
 
+import sched
 import time
+from hashlib import blake2b
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Callable
 import threading
@@ -11,6 +14,35 @@ import json
 import os
 from modules.helpers import print_lg
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# One shared scheduler for all periodic secret checks, run by a single lazy
+# daemon thread, instead of a dedicated sleeping thread per manager instance
+_scheduler = sched.scheduler(time.time, time.sleep)
+_scheduler_thread = None
+_scheduler_lock = threading.Lock()
+
+
+def _ensure_scheduler_thread():
+    """Start (or restart) the shared scheduler thread on first use."""
+    global _scheduler_thread
+    with _scheduler_lock:
+        if _scheduler_thread is None or not _scheduler_thread.is_alive():
+            _scheduler_thread = threading.Thread(target=_run_scheduler, daemon=True)
+            _scheduler_thread.start()
+
+
+def _run_scheduler():
+    """Run the shared scheduler, idling briefly when its queue is empty."""
+    while True:
+        _scheduler.run(blocking=True)
+        time.sleep(1)
+
 
 class SecretsManager:
     """
@@ -23,17 +55,26 @@ class SecretsManager:
     - Rotation history tracking
     - Support for custom rotation logic
     """
-    
-    def __init__(self, vault=None):
+
+    __slots__ = ("vault", "store_value_hashes", "rotation_config",
+                 "rotation_history", "rotation_threads", "rotation_callbacks")
+
+    def __init__(self, vault=None, store_value_hashes: bool = False):
         """
         Initialize secrets manager.
         
         Args:
             vault: EncryptedVault instance for storing secrets
+            store_value_hashes: Record short blake2b digests of old/new
+                                values in the rotation history (off by
+                                default - builtin hash() is salted per
+                                process, so it never had audit value)
         """
         self.vault = vault
+        self.store_value_hashes = store_value_hashes
         self.rotation_config = {}
-        self.rotation_history = []
+        # Bounded so a long-lived process can't grow the history unboundedly
+        self.rotation_history = deque(maxlen=10000)
         self.rotation_threads = {}
         self.rotation_callbacks = {}
         
@@ -52,24 +93,23 @@ class SecretsManager:
         Returns:
             True if registered
         """
-        try:
-            self.rotation_config[secret_name] = {
-                "rotation_days": rotation_days,
-                "last_rotation": datetime.now().isoformat(),
-                "next_rotation": (datetime.now() + timedelta(days=rotation_days)).isoformat(),
-                "rotation_count": 0,
-                "enabled": True
-            }
-            
-            if callback:
-                self.rotation_callbacks[secret_name] = callback
-            
-            print_lg(f"[SECRETS] Registered secret for rotation: {secret_name} (every {rotation_days} days)")
-            return True
-            
-        except Exception as e:
-            print_lg(f"[SECRETS] Error registering secret {secret_name}: {e}")
-            return False
+        # Plain dict work - nothing here can fail, so no try/except
+        # Timestamps are kept as epoch seconds so due checks are integer
+        # compares; they are formatted to ISO only when reported. The next
+        # rotation is derived from last_rotation_ts + rotation_days on read,
+        # so there is no second timestamp to keep in sync
+        self.rotation_config[secret_name] = {
+            "rotation_days": rotation_days,
+            "last_rotation_ts": int(time.time()),
+            "rotation_count": 0,
+            "enabled": True
+        }
+        
+        if callback:
+            self.rotation_callbacks[secret_name] = callback
+        
+        print_lg(f"[SECRETS] Registered secret for rotation: {secret_name} (every {rotation_days} days)")
+        return True
     
     def check_due_rotations(self) -> list:
         """
@@ -79,16 +119,15 @@ class SecretsManager:
             List of secret names due for rotation
         """
         due_for_rotation = []
-        now = datetime.now()
-        
+        now_ts = int(time.time())
+
         for secret_name, config in self.rotation_config.items():
             if not config.get("enabled"):
                 continue
-            
-            next_rotation = datetime.fromisoformat(config["next_rotation"])
-            if now >= next_rotation:
+
+            if now_ts >= config["last_rotation_ts"] + config["rotation_days"] * 86400:
                 due_for_rotation.append(secret_name)
-        
+
         return due_for_rotation
     
     def rotate_secret(self, secret_name: str, new_value: str) -> bool:
@@ -102,53 +141,58 @@ class SecretsManager:
         Returns:
             True if rotation successful
         """
-        try:
-            if secret_name not in self.rotation_config:
-                print_lg(f"[SECRETS] Secret not registered for rotation: {secret_name}")
-                return False
-            
-            # Get old value before replacing
-            old_value = self.vault.get_credential(secret_name) if self.vault else None
-            
-            # Store new value
-            if self.vault:
+        if secret_name not in self.rotation_config:
+            print_lg(f"[SECRETS] Secret not registered for rotation: {secret_name}")
+            return False
+        
+        # Only the vault I/O can realistically fail, so the try scope is
+        # limited to it; the config/history updates below are straight-line
+        # One clock read for the whole rotation
+        now = datetime.now()
+        now_iso = now.isoformat()
+        now_ts = int(now.timestamp())
+        
+        old_value = None
+        if self.vault:
+            try:
+                old_value = self.vault.get_credential(secret_name)
                 self.vault.set_credential(
                     secret_name,
                     new_value,
-                    {"rotated_at": datetime.now().isoformat()}
+                    {"rotated_at": now_iso}
                 )
-            
-            # Update rotation config
-            self.rotation_config[secret_name]["last_rotation"] = datetime.now().isoformat()
-            rotation_days = self.rotation_config[secret_name]["rotation_days"]
-            self.rotation_config[secret_name]["next_rotation"] = (
-                datetime.now() + timedelta(days=rotation_days)
-            ).isoformat()
-            self.rotation_config[secret_name]["rotation_count"] += 1
-            
-            # Call rotation callback if registered
-            if secret_name in self.rotation_callbacks:
-                try:
-                    self.rotation_callbacks[secret_name](new_value, old_value)
-                    print_lg(f"[SECRETS] Rotation callback executed for {secret_name}")
-                except Exception as e:
-                    print_lg(f"[SECRETS] Rotation callback failed for {secret_name}: {e}")
-            
-            # Log rotation
-            self.rotation_history.append({
-                "timestamp": datetime.now().isoformat(),
-                "secret": secret_name,
-                "old_value_hash": hash(old_value) if old_value else None,
-                "new_value_hash": hash(new_value),
-                "success": True
-            })
-            
-            print_lg(f"[SECRETS] Successfully rotated secret: {secret_name}")
-            return True
-            
-        except Exception as e:
-            print_lg(f"[SECRETS] Error rotating secret {secret_name}: {e}")
-            return False
+            except Exception as e:
+                print_lg(f"[SECRETS] Error rotating secret {secret_name}: {e}")
+                return False
+        
+        # Update rotation config
+        cfg = self.rotation_config[secret_name]
+        cfg["last_rotation_ts"] = now_ts
+        cfg["rotation_count"] += 1
+        
+        # Call rotation callback if registered
+        if secret_name in self.rotation_callbacks:
+            try:
+                self.rotation_callbacks[secret_name](new_value, old_value)
+                print_lg(f"[SECRETS] Rotation callback executed for {secret_name}")
+            except Exception as e:
+                print_lg(f"[SECRETS] Rotation callback failed for {secret_name}: {e}")
+        
+        # Log rotation
+        entry = {
+            "timestamp": now_iso,
+            "secret": secret_name,
+            "success": True
+        }
+        if self.store_value_hashes:
+            entry["old_value_hash"] = (
+                blake2b(old_value.encode(), digest_size=8).hexdigest() if old_value else None
+            )
+            entry["new_value_hash"] = blake2b(new_value.encode(), digest_size=8).hexdigest()
+        self.rotation_history.append(entry)
+        
+        print_lg(f"[SECRETS] Successfully rotated secret: {secret_name}")
+        return True
     
     def get_rotation_status(self, secret_name: str = None) -> Dict:
         """
@@ -160,18 +204,20 @@ class SecretsManager:
         Returns:
             Dict with rotation status
         """
+        # One clock read shared by both branches
+        now_ts = int(time.time())
+        
         if secret_name:
             if secret_name in self.rotation_config:
                 config = self.rotation_config[secret_name]
-                next_rotation = datetime.fromisoformat(config["next_rotation"])
-                days_until = (next_rotation - datetime.now()).days
+                next_ts = config["last_rotation_ts"] + config["rotation_days"] * 86400
                 return {
                     "secret": secret_name,
                     "enabled": config["enabled"],
                     "rotation_days": config["rotation_days"],
-                    "last_rotation": config["last_rotation"],
-                    "next_rotation": config["next_rotation"],
-                    "days_until_rotation": max(0, days_until),
+                    "last_rotation": datetime.fromtimestamp(config["last_rotation_ts"]).isoformat(),
+                    "next_rotation": datetime.fromtimestamp(next_ts).isoformat(),
+                    "days_until_rotation": max(0, (next_ts - now_ts) // 86400),
                     "rotation_count": config["rotation_count"]
                 }
             return {"error": f"Secret not found: {secret_name}"}
@@ -179,8 +225,8 @@ class SecretsManager:
             # All secrets
             status = {}
             for secret_name, config in self.rotation_config.items():
-                next_rotation = datetime.fromisoformat(config["next_rotation"])
-                days_until = (next_rotation - datetime.now()).days
+                next_ts = config["last_rotation_ts"] + config["rotation_days"] * 86400
+                days_until = (next_ts - now_ts) // 86400
                 status[secret_name] = {
                     "enabled": config["enabled"],
                     "days_until_rotation": max(0, days_until),
@@ -190,16 +236,18 @@ class SecretsManager:
     
     def enable_secret(self, secret_name: str) -> bool:
         """Enable rotation for a secret."""
-        if secret_name in self.rotation_config:
-            self.rotation_config[secret_name]["enabled"] = True
+        cfg = self.rotation_config.get(secret_name)
+        if cfg is not None:
+            cfg["enabled"] = True
             print_lg(f"[SECRETS] Enabled rotation for: {secret_name}")
             return True
         return False
     
     def disable_secret(self, secret_name: str) -> bool:
         """Disable rotation for a secret."""
-        if secret_name in self.rotation_config:
-            self.rotation_config[secret_name]["enabled"] = False
+        cfg = self.rotation_config.get(secret_name)
+        if cfg is not None:
+            cfg["enabled"] = False
             print_lg(f"[SECRETS] Disabled rotation for: {secret_name}")
             return True
         return False
@@ -214,7 +262,8 @@ class SecretsManager:
         Returns:
             List of rotation events
         """
-        return self.rotation_history[-limit:]
+        history = self.rotation_history
+        return list(history)[-limit:] if limit < len(history) else list(history)
     
     def start_auto_rotation(self, check_interval_hours: int = 24) -> bool:
         """
@@ -227,19 +276,29 @@ class SecretsManager:
             True if started successfully
         """
         try:
-            def rotation_monitor():
-                """Background thread that monitors for due rotations."""
-                while True:
-                    time.sleep(check_interval_hours * 3600)  # Sleep for interval
-                    
-                    due_secrets = self.check_due_rotations()
-                    if due_secrets:
-                        print_lg(f"[SECRETS] Secrets due for rotation: {due_secrets}")
-                        # Emit alert or trigger rotation
+            interval = check_interval_hours * 3600
             
-            thread = threading.Thread(target=rotation_monitor, daemon=True)
-            thread.start()
-            self.rotation_threads["monitor"] = thread
+            def next_delay() -> float:
+                """Sleep until the nearest enabled rotation is actually due,
+                rather than waking on a fixed interval; the interval is the
+                upper bound and a minute the lower."""
+                deadlines = [c["last_rotation_ts"] + c["rotation_days"] * 86400
+                             for c in self.rotation_config.values() if c.get("enabled")]
+                if not deadlines:
+                    return interval
+                return max(60, min(min(deadlines) - time.time(), interval))
+            
+            def check_and_reschedule():
+                """Scheduler callback that monitors for due rotations."""
+                due_secrets = self.check_due_rotations()
+                if due_secrets:
+                    print_lg(f"[SECRETS] Secrets due for rotation: {due_secrets}")
+                    # Emit alert or trigger rotation
+                _scheduler.enter(next_delay(), 1, check_and_reschedule)
+            
+            _scheduler.enter(next_delay(), 1, check_and_reschedule)
+            _ensure_scheduler_thread()
+            self.rotation_threads["monitor"] = _scheduler_thread
             
             print_lg(f"[SECRETS] Started auto-rotation monitor (check every {check_interval_hours} hours)")
             return True
@@ -260,13 +319,28 @@ class SecretsManager:
         """
         config = {
             "managed_secrets": len(self.rotation_config),
-            "rotation_config": self.rotation_config,
+            # Epoch timestamps are formatted to ISO for the exported copy
+            "rotation_config": {
+                name: {
+                    "rotation_days": cfg["rotation_days"],
+                    "last_rotation": datetime.fromtimestamp(cfg["last_rotation_ts"]).isoformat(),
+                    "next_rotation": datetime.fromtimestamp(
+                        cfg["last_rotation_ts"] + cfg["rotation_days"] * 86400).isoformat(),
+                    "rotation_count": cfg["rotation_count"],
+                    "enabled": cfg["enabled"]
+                }
+                for name, cfg in self.rotation_config.items()
+            },
             "total_rotations": len(self.rotation_history)
         }
         
         if filepath:
-            with open(filepath, 'w') as f:
-                json.dump(config, f, indent=2)
+            if ORJSON_AVAILABLE:
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, 'w') as f:
+                    json.dump(config, f, indent=2)
             print_lg(f"[SECRETS] Exported rotation config to {filepath}")
         
         return config
@@ -3,127 +3,177 @@ Session State Manager - Persistent state across crashes and restarts
 Allows automatic recovery from interruptions
 """
 
+import atexit
 import json
 import os
+import time
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import Dict, Optional, Any
 from modules.helpers import print_lg
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    # ciso8601 parses ISO-8601 an order of magnitude faster than
+    # datetime.fromisoformat; the stored format stays the same either way
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = datetime.fromisoformat
+
+
+@dataclass(slots=True)
+class SessionStateData:
+    """Per-session counters and markers persisted for crash recovery.
+    Slotted so the per-application field accesses skip a dict lookup."""
+    session_id: str
+    start_time: str
+    applications_count: int = 0
+    skipped_count: int = 0
+    failed_count: int = 0
+    last_application_time: Optional[str] = None
+    last_applied_job_id: Optional[str] = None
+    is_crashed: bool = False
+    crash_reason: Optional[str] = None
+
 
 class SessionState:
     """
     Manages application session state (number of apps, current job, etc.)
     Persists to JSON file for crash recovery.
     """
-    
+
     STATE_FILE = "logs/session_state.json"
-    
+
+    __slots__ = ("state", "_dirty", "_last_flush", "_flush_every")
+
     def __init__(self):
-        self.state = {
-            "session_id": self._generate_session_id(),
-            "start_time": datetime.now().isoformat(),
-            "applications_count": 0,
-            "skipped_count": 0,
-            "failed_count": 0,
-            "last_application_time": None,
-            "last_applied_job_id": None,
-            "is_crashed": False,
-            "crash_reason": None,
-        }
+        self.state = self._new_state()
+        # record_* calls are batched: state is flushed every N events or
+        # 5 seconds instead of rewriting the file per job
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._flush_every = 10
+        atexit.register(self._flush_at_exit)
+        self._ensure_dir()
         self.load_or_create()
-    
+
+    def _new_state(self) -> SessionStateData:
+        """Build a fresh state record for a new session"""
+        return SessionStateData(
+            session_id=self._generate_session_id(),
+            start_time=datetime.now().isoformat(),
+        )
+
     def _generate_session_id(self) -> str:
         """Generate unique session ID"""
         return datetime.now().strftime("%Y%m%d_%H%M%S")
-    
+
     def load_or_create(self):
         """Load existing state or create new one"""
         if os.path.exists(self.STATE_FILE):
             try:
-                with open(self.STATE_FILE, 'r') as f:
-                    saved_state = json.load(f)
-                    self.state.update(saved_state)
-                    print_lg(f"[STATE] Loaded session state from {self.SESSION_FILE}")
+                with open(self.STATE_FILE, 'rb') as f:
+                    saved_state = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+                    for key, value in saved_state.items():
+                        if hasattr(self.state, key):
+                            setattr(self.state, key, value)
+                    print_lg(f"[STATE] Loaded session state from {self.STATE_FILE}")
             except Exception as e:
                 print_lg(f"[STATE] Warning: Failed to load session state: {e}")
-                self._ensure_dir()
-        else:
-            self._ensure_dir()
-    
+
     def _ensure_dir(self):
         """Ensure logs directory exists"""
         os.makedirs(os.path.dirname(self.STATE_FILE), exist_ok=True)
-    
-    def save(self):
-        """Persist state to disk"""
+
+    def save(self, pretty: bool = False):
+        """Persist state to disk atomically (write temp file, then rename)"""
         try:
             self._ensure_dir()
-            with open(self.STATE_FILE, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            state_dict = asdict(self.state)
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(state_dict, option=orjson.OPT_INDENT_2 if pretty else 0)
+            elif pretty:
+                data = json.dumps(state_dict, indent=2).encode()
+            else:
+                data = json.dumps(state_dict, separators=(",", ":")).encode()
+            tmp_file = self.STATE_FILE + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, self.STATE_FILE)
+            self._dirty = False
+            self._last_flush = time.monotonic()
         except Exception as e:
             print_lg(f"[STATE] Warning: Failed to save session state: {e}")
-    
+
+    def _maybe_flush(self):
+        """Save if enough events or time have accumulated since last flush"""
+        self._dirty = True
+        events = (self.state.applications_count + self.state.skipped_count
+                  + self.state.failed_count)
+        if events % self._flush_every == 0 or time.monotonic() - self._last_flush > 5.0:
+            self.save()
+
+    def _flush_at_exit(self):
+        """Write any unflushed changes on interpreter shutdown"""
+        if self._dirty:
+            self.save()
+
     def record_application(self, job_id: str):
         """Record successful application"""
-        self.state["applications_count"] += 1
-        self.state["last_application_time"] = datetime.now().isoformat()
-        self.state["last_applied_job_id"] = job_id
-        self.save()
-    
+        self.state.applications_count += 1
+        self.state.last_application_time = datetime.now().isoformat()
+        self.state.last_applied_job_id = job_id
+        self._maybe_flush()
+
     def record_skip(self, reason: str = None):
         """Record skipped job"""
-        self.state["skipped_count"] += 1
-        self.save()
-    
+        self.state.skipped_count += 1
+        self._maybe_flush()
+
     def record_failure(self, error: str):
         """Record failed application"""
-        self.state["failed_count"] += 1
-        self.save()
-    
+        self.state.failed_count += 1
+        self._maybe_flush()
+
     def mark_crashed(self, reason: str = None):
         """Mark session as crashed for recovery on restart"""
-        self.state["is_crashed"] = True
-        self.state["crash_reason"] = reason
+        self.state.is_crashed = True
+        self.state.crash_reason = reason
         self.save()
         print_lg(f"[STATE] Session marked as crashed: {reason}")
-    
+
     def mark_recovered(self):
         """Mark as recovered from crash"""
-        self.state["is_crashed"] = False
-        self.state["crash_reason"] = None
+        self.state.is_crashed = False
+        self.state.crash_reason = None
         self.save()
         print_lg("[STATE] Session recovered from crash")
-    
+
     def get_stats(self) -> Dict:
         """Get current session statistics"""
         return {
-            "session_id": self.state["session_id"],
+            "session_id": self.state.session_id,
             "duration_minutes": self._get_duration_minutes(),
-            "applications": self.state["applications_count"],
-            "skipped": self.state["skipped_count"],
-            "failed": self.state["failed_count"],
-            "last_applied_job": self.state["last_applied_job_id"],
-            "is_crashed": self.state["is_crashed"],
+            "applications": self.state.applications_count,
+            "skipped": self.state.skipped_count,
+            "failed": self.state.failed_count,
+            "last_applied_job": self.state.last_applied_job_id,
+            "is_crashed": self.state.is_crashed,
         }
-    
+
     def _get_duration_minutes(self) -> float:
         """Get elapsed time since session start"""
-        start = datetime.fromisoformat(self.state["start_time"])
+        start = parse_datetime(self.state.start_time)
         elapsed = datetime.now() - start
         return elapsed.total_seconds() / 60
-    
+
     def reset(self):
         """Reset state for new session"""
-        self.state = {
-            "session_id": self._generate_session_id(),
-            "start_time": datetime.now().isoformat(),
-            "applications_count": 0,
-            "skipped_count": 0,
-            "failed_count": 0,
-            "last_application_time": None,
-            "last_applied_job_id": None,
-            "is_crashed": False,
-            "crash_reason": None,
-        }
+        self.state = self._new_state()
         self.save()
         print_lg("[STATE] Session state reset")
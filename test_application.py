@@ -6,7 +6,10 @@ Tests all 3 phases: Safety & Stealth, Resume Intelligence, Security Hardening
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from importlib.metadata import version
+from importlib.util import find_spec
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -24,6 +27,11 @@ def print_test(name, passed, details=""):
     if details:
         print(f"       -> {details}")
 
+def check_installed(module_name):
+    """Cheap installed-check: find_spec reads package metadata without
+    importing (and without paying heavy import side effects)."""
+    return find_spec(module_name) is not None
+
 # Test Suite
 results = []
 
@@ -32,197 +40,107 @@ results = []
 # ============================================================================
 print_header("PHASE 0: Testing Core Dependencies")
 
-try:
-    import selenium
-    print_test("Selenium installed", True, f"version {selenium.__version__}")
+if check_installed("selenium"):
+    print_test("Selenium installed", True, f"version {version('selenium')}")
     results.append(True)
-except ImportError as e:
-    print_test("Selenium installed", False, str(e))
+else:
+    print_test("Selenium installed", False, "selenium not found")
     results.append(False)
 
-try:
-    import undetected_chromedriver as uc
+if check_installed("undetected_chromedriver"):
     print_test("Undetected ChromeDriver installed", True)
     results.append(True)
-except ImportError as e:
-    print_test("Undetected ChromeDriver installed", False, str(e))
+else:
+    print_test("Undetected ChromeDriver installed", False, "undetected_chromedriver not found")
     results.append(False)
 
-try:
-    from cryptography.fernet import Fernet
+if check_installed("cryptography"):
     print_test("Cryptography library installed", True)
     results.append(True)
-except ImportError as e:
-    print_test("Cryptography library installed", False, str(e))
+else:
+    print_test("Cryptography library installed", False, "cryptography not found")
     results.append(False)
 
-try:
-    import openai
+if check_installed("openai"):
     print_test("OpenAI library installed", True, "(optional)")
     results.append(True)
-except ImportError:
+else:
     print_test("OpenAI library installed", False, "(optional - LLM features limited)")
     results.append(True)  # Optional, don't fail
 
 # ============================================================================
-# PHASE 1: Safety & Stealth Modules
+# PHASE 1-3: Module Load Tests (run in parallel - imports are independent
+# and mostly disk-bound, so a thread pool overlaps them)
 # ============================================================================
-print_header("PHASE 1: Testing Safety & Stealth Components")
 
-try:
-    from modules.safety.scheduler import Scheduler
-    scheduler = Scheduler()
-    print_test("Scheduler module loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("Scheduler module loads", False, str(e))
-    results.append(False)
-
-try:
-    from modules.safety.rate_limiter import RateLimiter
-    rate_limiter = RateLimiter()
-    print_test("RateLimiter module loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("RateLimiter module loads", False, str(e))
-    results.append(False)
-
-try:
-    from modules.safety.stealth_engine import StealthEngine
-    stealth = StealthEngine()
-    print_test("StealthEngine module loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("StealthEngine module loads", False, str(e))
-    results.append(False)
-
-try:
-    from modules.safety.behavioral_heuristics import BehavioralHeuristics
-    behavior = BehavioralHeuristics()
-    print_test("BehavioralHeuristics module loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("BehavioralHeuristics module loads", False, str(e))
-    results.append(False)
-
-try:
+def run_test(name, fn, details=""):
+    """Run one load test; returns (name, passed, details)."""
+    try:
+        fn()
+        return (name, True, details)
+    except Exception as e:
+        return (name, False, str(e))
+
+def _load(module_path, class_name):
+    """Build a loader that imports a module and instantiates its class."""
+    def loader():
+        cls = getattr(__import__(module_path, fromlist=[class_name]), class_name)
+        cls()
+    return loader
+
+def _safety_config():
     from config.safety_config import enable_scheduler, enable_rate_limiting
     assert enable_scheduler is not None
-    print_test("Safety configuration loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("Safety configuration loads", False, str(e))
-    results.append(False)
-
-# ============================================================================
-# PHASE 2: Resume Intelligence Modules
-# ============================================================================
-print_header("PHASE 2: Testing Resume Intelligence Components")
-
-try:
-    from modules.resume.skill_extractor import SkillExtractor
-    extractor = SkillExtractor()
-    print_test("SkillExtractor module loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("SkillExtractor module loads", False, str(e))
-    results.append(False)
-
-try:
-    from modules.resume.skill_mapper import SkillMapper
-    mapper = SkillMapper()
-    print_test("SkillMapper module loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("SkillMapper module loads", False, str(e))
-    results.append(False)
-
-try:
-    from modules.resume.variant_generator import VariantGenerator
-    generator = VariantGenerator()
-    print_test("VariantGenerator module loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("VariantGenerator module loads", False, str(e))
-    results.append(False)
-
-try:
-    from modules.resume.ats_templates import ATSTemplate
-    ats = ATSTemplate()
-    print_test("ATSTemplate module loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("ATSTemplate module loads", False, str(e))
-    results.append(False)
 
-try:
-    from modules.resume.selector import ResumeSelector
-    selector = ResumeSelector()
-    print_test("ResumeSelector module loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("ResumeSelector module loads", False, str(e))
-    results.append(False)
-
-try:
+def _resume_config():
     from config.resume_config import RESUME_TYPES
     assert RESUME_TYPES is not None and len(RESUME_TYPES) > 0
-    print_test("Resume configuration loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("Resume configuration loads", False, str(e))
-    results.append(False)
-
-# ============================================================================
-# PHASE 3: Security Hardening Modules
-# ============================================================================
-print_header("PHASE 3: Testing Security Hardening Components")
-
-try:
-    from modules.security import EncryptedVault
-    vault = EncryptedVault()
-    print_test("EncryptedVault module loads", True, "AES-256 encryption ready")
-    results.append(True)
-except Exception as e:
-    print_test("EncryptedVault module loads", False, str(e))
-    results.append(False)
 
-try:
+def _secrets_manager():
     from modules.security import SecretsManager, EncryptedVault
-    vault = EncryptedVault()
-    manager = SecretsManager(vault)
-    print_test("SecretsManager module loads", True, "90-day rotation ready")
-    results.append(True)
-except Exception as e:
-    print_test("SecretsManager module loads", False, str(e))
-    results.append(False)
-
-try:
-    from modules.security import AuditLogger
-    logger = AuditLogger()
-    print_test("AuditLogger module loads", True, "Logs available at logs/security/audit.log")
-    results.append(True)
-except Exception as e:
-    print_test("AuditLogger module loads", False, str(e))
-    results.append(False)
+    SecretsManager(EncryptedVault())
 
-try:
-    from modules.security import AccountMonitor
-    monitor = AccountMonitor()
-    print_test("AccountMonitor module loads", True, "Anomaly detection ready")
-    results.append(True)
-except Exception as e:
-    print_test("AccountMonitor module loads", False, str(e))
-    results.append(False)
-
-try:
+def _security_config():
     from config.security_config import VAULT_CONFIG, SECRETS_ROTATION
     assert VAULT_CONFIG is not None and SECRETS_ROTATION is not None
-    print_test("Security configuration loads", True)
-    results.append(True)
-except Exception as e:
-    print_test("Security configuration loads", False, str(e))
-    results.append(False)
+
+LOAD_TESTS = [
+    ("PHASE 1: Testing Safety & Stealth Components", [
+        ("Scheduler module loads", _load("modules.safety.scheduler", "Scheduler"), ""),
+        ("RateLimiter module loads", _load("modules.safety.rate_limiter", "RateLimiter"), ""),
+        ("StealthEngine module loads", _load("modules.safety.stealth_engine", "StealthEngine"), ""),
+        ("BehavioralHeuristics module loads", _load("modules.safety.behavioral_heuristics", "BehavioralHeuristics"), ""),
+        ("Safety configuration loads", _safety_config, ""),
+    ]),
+    ("PHASE 2: Testing Resume Intelligence Components", [
+        ("SkillExtractor module loads", _load("modules.resume.skill_extractor", "SkillExtractor"), ""),
+        ("SkillMapper module loads", _load("modules.resume.skill_mapper", "SkillMapper"), ""),
+        ("VariantGenerator module loads", _load("modules.resume.variant_generator", "VariantGenerator"), ""),
+        ("ATSTemplate module loads", _load("modules.resume.ats_templates", "ATSTemplate"), ""),
+        ("ResumeSelector module loads", _load("modules.resume.selector", "ResumeSelector"), ""),
+        ("Resume configuration loads", _resume_config, ""),
+    ]),
+    ("PHASE 3: Testing Security Hardening Components", [
+        ("EncryptedVault module loads", _load("modules.security", "EncryptedVault"), "AES-256 encryption ready"),
+        ("SecretsManager module loads", _secrets_manager, "90-day rotation ready"),
+        ("AuditLogger module loads", _load("modules.security", "AuditLogger"), "Logs available at logs/security/audit.log"),
+        ("AccountMonitor module loads", _load("modules.security", "AccountMonitor"), "Anomaly detection ready"),
+        ("Security configuration loads", _security_config, ""),
+    ]),
+]
+
+with ThreadPoolExecutor(max_workers=8) as pool:
+    phase_futures = [
+        (header, [pool.submit(run_test, name, fn, details) for name, fn, details in tests])
+        for header, tests in LOAD_TESTS
+    ]
+    # Results are printed in declaration order regardless of completion order
+    for header, futures in phase_futures:
+        print_header(header)
+        for future in futures:
+            name, passed, details = future.result()
+            print_test(name, passed, details if passed else details)
+            results.append(passed)
 
 # ============================================================================
 # PHASE 3: Security Functionality Tests